@@ -2,10 +2,15 @@
 Database setup and connection management.
 """
 
+import logging
 from typing import AsyncGenerator
-from sqlalchemy import Column, String, Integer, Text, Date, create_engine
+from sqlalchemy import Column, String, Integer, Text, Date, Index, create_engine, event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
+
+logger = logging.getLogger("legal_api")
 
 Base = declarative_base()
 
@@ -13,6 +18,9 @@ Base = declarative_base()
 engine = None
 async_session = None
 
+# Set by init_db once the FTS5 index is in place (SQLite only)
+_fts_enabled = False
+
 
 class Case(Base):
     """Case law database model."""
@@ -21,28 +29,199 @@ class Case(Base):
     id = Column(String, primary_key=True)
     title = Column(String, nullable=False)
     citation = Column(String, index=True)
-    court = Column(String, index=True)
-    date = Column(String, index=True)  # ISO format
+    court = Column(String)
+    date = Column(String)  # ISO format
     year = Column(Integer, index=True)
     judges = Column(Text)  # JSON array
     headnote = Column(Text)
     text = Column(Text)
 
+    __table_args__ = (
+        # Combined court/year/date filters in a single range scan
+        Index("ix_cases_court_year_date", "court", "year", "date"),
+        # Keyset pagination order (date DESC, id DESC)
+        Index("ix_cases_date_id", "date", "id"),
+    )
+
+
+# Single-column indexes superseded by the composite ones above
+_OBSOLETE_INDEXES = ("ix_cases_court", "ix_cases_date")
+
+
+def _migrate_indexes(conn) -> None:
+    """Drop superseded indexes and add new ones to an existing ``cases`` table."""
+    for name in _OBSOLETE_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    # create_all skips tables that already exist, indexes included
+    for index in Case.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+# Applied to every new SQLite connection. WAL lets readers proceed while a
+# writer is active; the mmap and page cache keep hot pages of the large
+# ``text`` column out of read() syscalls.
+_SQLITE_PRAGMAS = (
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",  # 256 MB
+    "cache_size=-65536",  # 64 MB
+)
+
+
+def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    """Switch the connection to WAL mode and apply tuning PRAGMAs."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    journal_mode = cursor.fetchone()[0]
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+    # In-memory databases report "memory"; anything else means WAL was refused
+    if journal_mode.lower() not in ("wal", "memory"):
+        logger.warning("SQLite journal_mode is %s, expected wal", journal_mode)
+    else:
+        logger.debug("SQLite journal_mode=%s", journal_mode)
+
+
+# External-content FTS5 index over the searchable columns of ``cases``.
+# ``cases`` has a string primary key, so SQLite may renumber its implicit
+# rowid on VACUUM; MATCH would then join to the wrong cases. Call
+# rebuild_fts() after every VACUUM (see README, "Maintenance").
+_FTS_REBUILD = text("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')")
+
+_FTS_COLUMNS = "title, headnote, text, citation"
+
+_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+        {_FTS_COLUMNS},
+        content='cases', content_rowid='rowid', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cases_fts_ai AFTER INSERT ON cases BEGIN
+        INSERT INTO cases_fts(rowid, {_FTS_COLUMNS})
+        VALUES (new.rowid, new.title, new.headnote, new.text, new.citation);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cases_fts_ad AFTER DELETE ON cases BEGIN
+        INSERT INTO cases_fts(cases_fts, rowid, {_FTS_COLUMNS})
+        VALUES ('delete', old.rowid, old.title, old.headnote, old.text, old.citation);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cases_fts_au AFTER UPDATE ON cases BEGIN
+        INSERT INTO cases_fts(cases_fts, rowid, {_FTS_COLUMNS})
+        VALUES ('delete', old.rowid, old.title, old.headnote, old.text, old.citation);
+        INSERT INTO cases_fts(rowid, {_FTS_COLUMNS})
+        VALUES (new.rowid, new.title, new.headnote, new.text, new.citation);
+    END
+    """,
+]
+
 
-async def init_db(database_url: str):
+# Trigram GIN indexes let PostgreSQL serve ILIKE '%term%' from an index.
+# Needs the pg_trgm extension, which may require elevated privileges.
+_TRGM_COLUMNS = ("title", "headnote", "text", "citation")
+
+
+async def init_db(
+    database_url: str,
+    pool_size: int = 20,
+    max_overflow: int = 10,
+    pool_timeout: int = 30,
+    pool_recycle: int = 3600,
+):
     """Initialize database connection."""
-    global engine, async_session
+    global engine, async_session, _fts_enabled
     
     # Convert sqlite URL for async
     if database_url.startswith("sqlite:///"):
         database_url = database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
     
-    engine = create_async_engine(database_url, echo=False)
+    if database_url.startswith("sqlite") and ":memory:" in database_url:
+        # An in-memory database lives on a single connection; share it
+        engine = create_async_engine(
+            database_url,
+            echo=False,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+    else:
+        engine = create_async_engine(
+            database_url,
+            echo=False,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=True,
+        )
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+
     async_session = async_sessionmaker(engine, expire_on_commit=False)
     
     # Create tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_migrate_indexes)
+
+    if engine.dialect.name == "sqlite":
+        _fts_enabled = await _init_fts()
+    elif engine.dialect.name == "postgresql":
+        await _init_trgm()
+
+
+async def _init_fts() -> bool:
+    """Create the FTS5 index and sync triggers; False if FTS5 is unavailable."""
+    async with engine.begin() as conn:
+        exists = await conn.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cases_fts'")
+        )
+        try:
+            for ddl in _FTS_DDL:
+                await conn.execute(text(ddl))
+        except OperationalError:
+            # SQLite built without FTS5 — search falls back to LIKE matching
+            return False
+        # Triggers keep the index in sync from here on; only backfill once
+        if not exists:
+            await conn.execute(_FTS_REBUILD)
+    return True
+
+
+async def rebuild_fts() -> None:
+    """
+    Re-index every case from the ``cases`` table.
+
+    Required after VACUUM, and after writes that bypass the sync triggers.
+    Does nothing when the FTS5 index is not in use.
+    """
+    if not _fts_enabled:
+        return
+    async with engine.begin() as conn:
+        await conn.execute(_FTS_REBUILD)
+
+
+async def _init_trgm() -> None:
+    """Create trigram indexes for substring search, if pg_trgm is available."""
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for name in _TRGM_COLUMNS:
+                await conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_cases_{name}_trgm "
+                    f"ON cases USING gin ({name} gin_trgm_ops)"
+                ))
+    except DBAPIError as exc:
+        logger.warning("pg_trgm unavailable, substring search will scan: %s", exc)
+
+
+def fts_enabled() -> bool:
+    """Whether full-text search can use the FTS5 index."""
+    return _fts_enabled
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -4,26 +4,30 @@ Legal API - FastAPI REST backend for case law search.
 A generic, jurisdiction-agnostic API for legal research.
 """
 
+import hmac
 import os
 from contextlib import asynccontextmanager
 from typing import Optional
 
 from fastapi import FastAPI, Depends, HTTPException, Query, Security, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security.api_key import APIKeyHeader
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from pydantic_settings import BaseSettings
+from pydantic import TypeAdapter
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 from database import init_db, get_db, AsyncSession
-from models import CaseResponse, CaseDetail, SearchResponse, StatsResponse
+from models import CaseResponse, CaseDetail, SearchResponse, StatsResponse, CourtStats, YearStats, CourtList
 from services.search import search_cases, get_case_by_id
-from services.stats import get_statistics, get_court_stats, get_year_stats
-from services.export import export_cases_csv, export_cases_jsonl
-from middleware import RequestLoggingMiddleware, setup_logging
+from services.stats import (
+    get_statistics, get_court_stats, get_court_names, get_year_stats, configure_stats_cache,
+)
+from services.export import count_export_rows, export_cases_csv, export_cases_jsonl, zstd_stream
+from middleware import HealthCheckMiddleware, RequestLoggingMiddleware, setup_logging
 
 load_dotenv()
 
@@ -33,6 +37,11 @@ class Settings(BaseSettings):
     api_title: str = "Legal Case Law API"
     api_version: str = "1.0.0"
     database_url: str = "sqlite+aiosqlite:///./legal.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 3600
+    stats_cache_ttl: int = 300
     per_page_default: int = 20
     per_page_max: int = 100
     api_key_enabled: bool = False
@@ -41,12 +50,17 @@ class Settings(BaseSettings):
 
     log_level: str = "INFO"
 
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
 
 
 settings = Settings()
 
+# Hot-path settings, read once instead of through the model on every request
+_API_KEY_ENABLED = settings.api_key_enabled
+_API_KEY = settings.api_key.encode()
+_PER_PAGE_DEFAULT = settings.per_page_default
+_PER_PAGE_MAX = settings.per_page_max
+
 # Structured request logging
 setup_logging(settings.log_level)
 
@@ -59,17 +73,25 @@ api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 async def verify_api_key(api_key: str = Security(api_key_header)):
     """Verify API key if authentication is enabled."""
-    if not settings.api_key_enabled:
+    if not _API_KEY_ENABLED:
         return True
-    if not api_key or api_key != settings.api_key:
+    # Constant-time comparison so response timing doesn't leak the key
+    if not api_key or not hmac.compare_digest(api_key.encode(), _API_KEY):
         raise HTTPException(status_code=403, detail="Invalid API key")
     return True
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
-    await init_db(settings.database_url)
+    """Initialize database and caches on startup."""
+    configure_stats_cache(settings.stats_cache_ttl)
+    await init_db(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
     yield
 
 
@@ -96,6 +118,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Pre-encoded: /health is polled constantly by load balancers and probes, so
+# it is answered ahead of the middleware above (added last = runs first)
+_HEALTH_BODY = b'{"status":"healthy"}'
+app.add_middleware(HealthCheckMiddleware, path="/health", body=_HEALTH_BODY)
+
 
 # ─── Search Endpoints ────────────────────────────────────────────────────────
 
@@ -109,9 +136,13 @@ async def search(
     year: Optional[int] = Query(None, description="Filter by year"),
     date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(
+        1, ge=1, deprecated=True,
+        description="Page number (OFFSET pagination; prefer cursor)",
+    ),
     per_page: int = Query(None, ge=1, le=100, description="Results per page"),
     highlight: bool = Query(True, description="Highlight matching terms in snippets"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_api_key),
 ):
@@ -120,21 +151,27 @@ async def search(
     
     Returns paginated results with relevance ranking.
     Set ``highlight=false`` to disable ``<mark>`` tag wrapping in snippets.
+    Pass ``cursor`` (the ``next_cursor`` of the previous response) to page
+    through results without the cost of OFFSET or a total count.
     """
-    per_page = per_page or settings.per_page_default
-    per_page = min(per_page, settings.per_page_max)
+    per_page = per_page or _PER_PAGE_DEFAULT
+    per_page = min(per_page, _PER_PAGE_MAX)
     
-    results = await search_cases(
-        db=db,
-        query=q,
-        court=court,
-        year=year,
-        date_from=date_from,
-        date_to=date_to,
-        page=page,
-        per_page=per_page,
-        highlight=highlight,
-    )
+    try:
+        results = await search_cases(
+            db=db,
+            query=q,
+            court=court,
+            year=year,
+            date_from=date_from,
+            date_to=date_to,
+            page=page,
+            per_page=per_page,
+            highlight=highlight,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     
     return results
 
@@ -160,6 +197,25 @@ async def get_case(
 # ─── Statistics Endpoints ────────────────────────────────────────────────────
 
 
+# Encoded bodies of the TTL-cached stats, by endpoint. The stats services
+# return the same object until their cache entry expires, so an identity
+# check is enough to know when to encode again.
+_encoded_stats: dict[str, tuple[object, bytes]] = {}
+
+_STATS_ADAPTER = TypeAdapter(StatsResponse)
+_COURT_STATS_ADAPTER = TypeAdapter(list[CourtStats])
+_YEAR_STATS_ADAPTER = TypeAdapter(list[YearStats])
+
+
+def _stats_response(key: str, data, adapter: TypeAdapter) -> Response:
+    """JSON response for ``data``, validated and encoded once per cache fill."""
+    encoded = _encoded_stats.get(key)
+    if encoded is None or encoded[0] is not data:
+        encoded = (data, adapter.dump_json(adapter.validate_python(data)))
+        _encoded_stats[key] = encoded
+    return Response(content=encoded[1], media_type="application/json")
+
+
 @app.get("/api/v1/stats", response_model=StatsResponse)
 async def stats(
     db: AsyncSession = Depends(get_db),
@@ -168,10 +224,10 @@ async def stats(
     """
     Get overall statistics.
     """
-    return await get_statistics(db)
+    return _stats_response("overall", await get_statistics(db), _STATS_ADAPTER)
 
 
-@app.get("/api/v1/stats/courts")
+@app.get("/api/v1/stats/courts", response_model=list[CourtStats])
 async def stats_by_court(
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_api_key),
@@ -179,10 +235,10 @@ async def stats_by_court(
     """
     Get case count by court.
     """
-    return await get_court_stats(db)
+    return _stats_response("courts", await get_court_stats(db), _COURT_STATS_ADAPTER)
 
 
-@app.get("/api/v1/stats/years")
+@app.get("/api/v1/stats/years", response_model=list[YearStats])
 async def stats_by_year(
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_api_key),
@@ -190,7 +246,7 @@ async def stats_by_year(
     """
     Get case count by year.
     """
-    return await get_year_stats(db)
+    return _stats_response("years", await get_year_stats(db), _YEAR_STATS_ADAPTER)
 
 
 # ─── Export Endpoints ─────────────────────────────────────────────────────────
@@ -212,19 +268,16 @@ async def export_csv(
     """
     Export search results as CSV.
 
-    Returns a downloadable CSV file with matching cases.
+    Streams a downloadable CSV file with matching cases.
     """
-    csv_text, count = await export_cases_csv(
-        db=db, query=q, court=court, year=year,
+    filters = dict(
+        query=q, court=court, year=year,
         date_from=date_from, date_to=date_to, limit=limit,
     )
-    return PlainTextResponse(
-        content=csv_text,
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=legal-export-{count}-cases.csv",
-            "X-Export-Count": str(count),
-        },
+    count = await count_export_rows(db=db, **filters)
+    return _export_response(
+        request, export_cases_csv(db=db, **filters), "text/csv",
+        f"legal-export-{count}-cases.csv", count,
     )
 
 
@@ -246,24 +299,49 @@ async def export_jsonl(
 
     Useful for bulk ingestion into data pipelines or vector databases.
     """
-    jsonl_text, count = await export_cases_jsonl(
-        db=db, query=q, court=court, year=year,
+    filters = dict(
+        query=q, court=court, year=year,
         date_from=date_from, date_to=date_to, limit=limit,
     )
-    return PlainTextResponse(
-        content=jsonl_text,
-        media_type="application/x-ndjson",
-        headers={
-            "Content-Disposition": f"attachment; filename=legal-export-{count}-cases.jsonl",
-            "X-Export-Count": str(count),
-        },
+    count = await count_export_rows(db=db, **filters)
+    return _export_response(
+        request, export_cases_jsonl(db=db, **filters), "application/x-ndjson",
+        f"legal-export-{count}-cases.jsonl", count,
     )
 
 
+def _export_response(
+    request: Request, body, media_type: str, filename: str, count: int,
+) -> StreamingResponse:
+    """Stream an export, zstd-compressed when the client accepts it."""
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "X-Export-Count": str(count),
+        "Vary": "Accept-Encoding",
+    }
+    if _accepts_zstd(request.headers.get("accept-encoding", "")):
+        body = zstd_stream(body)
+        headers["Content-Encoding"] = "zstd"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+def _accepts_zstd(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows zstd (and not with q=0)."""
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() == "zstd":
+            q = params.strip().removeprefix("q=")
+            try:
+                return not params.strip() or float(q) > 0
+            except ValueError:
+                return False
+    return False
+
+
 # ─── Utility Endpoints ───────────────────────────────────────────────────────
 
 
-@app.get("/api/v1/courts")
+@app.get("/api/v1/courts", response_model=CourtList)
 async def list_courts(
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_api_key),
@@ -271,14 +349,18 @@ async def list_courts(
     """
     List all available courts.
     """
-    courts = await get_court_stats(db)
-    return {"courts": [c["court"] for c in courts]}
+    return {"courts": await get_court_names(db)}
 
 
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """
+    Health check endpoint (no auth, DB, or rate limit).
+
+    Requests are answered by HealthCheckMiddleware; the route documents the
+    endpoint and serves as a fallback.
+    """
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
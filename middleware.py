@@ -3,16 +3,57 @@ Middleware for request logging, correlation IDs, and response timing.
 """
 
 import logging
+import os
 import time
-import uuid
+from contextvars import ContextVar
+from typing import Optional
 
+import orjson
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = logging.getLogger("legal_api")
 
 
+# Bound once: _uuid7 runs for every request without an X-Request-ID
+_urandom = os.urandom
+_time_ns = time.time_ns
+
+
+def _uuid7() -> str:
+    """
+    Time-ordered UUIDv7 (RFC 9562): 48-bit Unix ms timestamp + 74 random bits.
+
+    IDs sort by creation time, which keeps log searches by request ID cheap.
+    (``uuid.uuid7`` only exists from Python 3.14.)
+    """
+    b = bytearray((_time_ns() // 1_000_000).to_bytes(6, "big") + _urandom(10))
+    b[6] = 0x70 | b[6] & 0x0F  # version
+    b[8] = 0x80 | b[8] & 0x3F  # variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _elapsed_ms(start_ns: int) -> str:
+    """Milliseconds since ``start_ns`` (a perf_counter_ns value), e.g. "12.345"."""
+    # Integer arithmetic: no float rounding or float formatting per request
+    ms, us = divmod((time.perf_counter_ns() - start_ns) // 1000, 1000)
+    return f"{ms}.{us:03d}"
+
+
+# (request_id, method, path, query, client) of the request being handled.
+# Set once per request and read by JsonFormatter, so every log line emitted
+# while serving the request carries the correlation fields.
+request_context: ContextVar[Optional[tuple]] = ContextVar("request_context", default=None)
+
+_CONTEXT_FIELDS = ("request_id", "method", "path", "query", "client")
+
+# Passed per record via ``extra=``; JsonFormatter copies them when present
+_RECORD_FIELDS = ("status", "duration_ms")
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
     Add correlation ID to every request and log request/response details.
@@ -23,51 +64,104 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         # Use client-provided ID or generate one
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-        start = time.perf_counter()
-
-        response: Response = await call_next(request)
-
-        duration_ms = round((time.perf_counter() - start) * 1000, 2)
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Response-Time"] = f"{duration_ms}ms"
-
-        logger.info(
-            "request",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "query": str(request.url.query),
-                "status": response.status_code,
-                "duration_ms": duration_ms,
-                "client": request.client.host if request.client else "unknown",
-            },
-        )
+        request_id = request.headers.get("X-Request-ID") or _uuid7()
+
+        token = request_context.set((
+            request_id,
+            request.method,
+            request.url.path,
+            request.url.query,
+            request.client.host if request.client else "unknown",
+        ))
+        start = time.perf_counter_ns()
+
+        try:
+            response: Response = await call_next(request)
+
+            duration_ms = _elapsed_ms(start)
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Response-Time"] = duration_ms + "ms"
+
+            logger.info(
+                "request -> %d (%sms)", response.status_code, duration_ms,
+                extra={"status": response.status_code, "duration_ms": float(duration_ms)},
+            )
+        finally:
+            request_context.reset(token)
 
         return response
 
 
-def setup_logging(level: str = "INFO") -> None:
-    """Configure structured JSON-style logging."""
-    fmt = (
-        "%(asctime)s | %(levelname)-5s | %(name)s | "
-        "%(message)s | %(request_id)s | %(method)s %(path)s "
-        "-> %(status)s (%(duration_ms)sms)"
-    )
-
-    class _Filter(logging.Filter):
-        """Ensure extra fields exist even for non-request logs."""
-
-        def filter(self, record: logging.LogRecord) -> bool:
-            for key in ("request_id", "method", "path", "query", "status", "duration_ms", "client"):
-                if not hasattr(record, key):
-                    setattr(record, key, "-")
-            return True
+class HealthCheckMiddleware:
+    """
+    Answer ``GET <path>`` with a fixed JSON body before the rest of the stack.
 
+    Liveness probes hit the health check at several Hz; this skips CORS,
+    request logging and routing for them. The response still carries the
+    ``X-Request-ID`` and ``X-Response-Time`` headers every response gets.
+    """
+
+    def __init__(self, app: ASGIApp, path: str, body: bytes) -> None:
+        self.app = app
+        self.path = path
+        self.body = body
+        self.content_length = str(len(body)).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"] != self.path
+            or scope["method"] != "GET"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        request_id = next(
+            (v for k, v in scope["headers"] if k == b"x-request-id"), None
+        ) or _uuid7().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", self.content_length),
+                (b"x-request-id", request_id),
+                (b"x-response-time", (_elapsed_ms(start) + "ms").encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Render each record as one JSON object, including the request context
+    and any ``_RECORD_FIELDS`` passed as ``extra``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        context = request_context.get()
+        if context is not None:
+            entry.update(zip(_CONTEXT_FIELDS, context, strict=True))
+        for field in _RECORD_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+def setup_logging(level: str = "INFO") -> None:
+    """Configure structured JSON logging."""
     handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter(fmt))
-    handler.addFilter(_Filter())
+    handler.setFormatter(JsonFormatter())
 
     root = logging.getLogger("legal_api")
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
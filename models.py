@@ -4,7 +4,7 @@ Pydantic models for request/response schemas.
 
 from datetime import date
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class CaseBase(BaseModel):
@@ -19,7 +19,7 @@ class CaseBase(BaseModel):
 class CaseResponse(CaseBase):
     """Case in search results (abbreviated)."""
     snippet: Optional[str] = None
-    relevance: Optional[float] = None
+    relevance: float = 1.0
 
 
 class CaseDetail(CaseBase):
@@ -28,17 +28,24 @@ class CaseDetail(CaseBase):
     headnote: Optional[str] = None
     text: Optional[str] = None
     citations_found: Optional[list[str]] = None
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SearchResponse(BaseModel):
-    """Paginated search results."""
-    total: int
+    """Paginated search results.
+
+    ``total`` and ``total_pages`` are omitted (``None``) for cursor pages.
+    ``total_is_estimate`` means ``total`` is a lower bound: counting stops at
+    a cap to bound the cost of very broad queries.
+    """
+    total: Optional[int] = None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    total_is_estimate: bool = False
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     results: list[CaseResponse]
 
 
@@ -60,3 +67,8 @@ class YearStats(BaseModel):
     """Statistics by year."""
     year: int
     count: int
+
+
+class CourtList(BaseModel):
+    """Names of all courts with cases."""
+    courts: list[str]
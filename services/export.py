@@ -1,20 +1,28 @@
 """
-Export service — generate CSV and JSONL downloads from search results.
+Export service — stream CSV and JSONL downloads of search results.
 """
 
-import csv
-import io
-import json
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import select, func, or_, and_
+import orjson
+import zstandard
+from sqlalchemy import Row, Select, select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import Case
+from database import Case, fts_enabled
+from services.fts import apply_match, bm25_score, like_condition, match_expression
 
 # Maximum rows for a single export (prevents abuse)
 MAX_EXPORT_ROWS = 10_000
 
+# Rows fetched from the database (and encoded) per streamed chunk
+EXPORT_BATCH_SIZE = 500
+
+# zstd level for compressed exports: fast, and text still shrinks several-fold
+ZSTD_LEVEL = 3
+
+CSV_HEADER = ["id", "title", "citation", "court", "date", "year", "judges", "headnote"]
+
 
 async def export_cases_csv(
     db: AsyncSession,
@@ -24,31 +32,28 @@ async def export_cases_csv(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     limit: int = MAX_EXPORT_ROWS,
-) -> tuple[str, int]:
+) -> AsyncIterator[str]:
     """
-    Export matching cases as CSV text.
+    Stream matching cases as CSV text.
 
-    Returns (csv_string, row_count).
+    Yields the header row first, then one chunk per batch of rows.
     """
-    cases = await _fetch_export_rows(db, query, court, year, date_from, date_to, limit)
-
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(["id", "title", "citation", "court", "date", "year", "judges", "headnote"])
-
-    for c in cases:
-        writer.writerow([
-            c.id,
-            c.title,
-            c.citation or "",
-            c.court or "",
-            c.date or "",
-            c.year or "",
-            c.judges or "",
-            (c.headnote or "")[:500],  # Truncate for CSV readability
-        ])
-
-    return buf.getvalue(), len(cases)
+    yield _csv_line(CSV_HEADER)
+
+    async for cases in _stream_export_rows(db, query, court, year, date_from, date_to, limit):
+        yield "".join(
+            _csv_line((
+                c.id,
+                c.title,
+                c.citation or "",
+                c.court or "",
+                c.date or "",
+                c.year or "",
+                c.judges or "",
+                (c.headnote or "")[:500],  # Truncate for CSV readability
+            ))
+            for c in cases
+        )
 
 
 async def export_cases_jsonl(
@@ -59,57 +64,105 @@ async def export_cases_jsonl(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     limit: int = MAX_EXPORT_ROWS,
-) -> tuple[str, int]:
+) -> AsyncIterator[bytes]:
     """
-    Export matching cases as JSONL (one JSON object per line).
+    Stream matching cases as JSONL (one JSON object per line).
 
-    Returns (jsonl_string, row_count).
+    Yields one chunk per batch of rows.
     """
-    cases = await _fetch_export_rows(db, query, court, year, date_from, date_to, limit)
+    async for cases in _stream_export_rows(db, query, court, year, date_from, date_to, limit):
+        yield b"".join(
+            orjson.dumps({
+                "id": c.id,
+                "title": c.title,
+                "citation": c.citation,
+                "court": c.court,
+                "date": c.date,
+                "year": c.year,
+                "judges": c.judges,
+                "headnote": c.headnote,
+            }, option=orjson.OPT_APPEND_NEWLINE)
+            for c in cases
+        )
 
-    lines = []
-    for c in cases:
-        obj = {
-            "id": c.id,
-            "title": c.title,
-            "citation": c.citation,
-            "court": c.court,
-            "date": c.date,
-            "year": c.year,
-            "judges": c.judges,
-            "headnote": c.headnote,
-        }
-        lines.append(json.dumps(obj, ensure_ascii=False))
 
-    return "\n".join(lines), len(cases)
+async def count_export_rows(
+    db: AsyncSession,
+    query: str,
+    court: Optional[str] = None,
+    year: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = MAX_EXPORT_ROWS,
+) -> int:
+    """Number of rows an export with the same arguments will produce."""
+    stmt = _export_statement(query, court, year, date_from, date_to, limit)
+    # Runs before the first byte is sent: the row order doesn't change how
+    # many rows the LIMIT keeps, so skip BM25 ranking and the wide columns
+    stmt = stmt.with_only_columns(Case.id).order_by(None)
+    return await db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
 
 
-# ── Internal ──────────────────────────────────────────────────────────────────
+async def zstd_stream(chunks: AsyncIterator[str | bytes]) -> AsyncIterator[bytes]:
+    """
+    Compress an export stream into a single zstd frame.
+
+    Output is yielded as the compressor fills blocks, so the download stays
+    streamed; the frame is closed once the source is exhausted.
+    """
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
 
 
-async def _fetch_export_rows(
-    db: AsyncSession,
+# ── Internal ──────────────────────────────────────────────────────────────────
+
+# Exported fields only — the full judgment text is never part of an export
+_EXPORT_COLUMNS = (
+    Case.id,
+    Case.title,
+    Case.citation,
+    Case.court,
+    Case.date,
+    Case.year,
+    Case.judges,
+    Case.headnote,
+)
+
+
+def _csv_line(fields) -> str:
+    """Format one record exactly as the default ``csv.writer`` would."""
+    out = []
+    for value in fields:
+        text = str(value)
+        # Quote only fields with a delimiter, quote, or line break (QUOTE_MINIMAL).
+        # Substring tests are memchr scans; a regex search per field costs more
+        if "," in text or '"' in text or "\n" in text or "\r" in text:
+            text = '"' + text.replace('"', '""') + '"'
+        out.append(text)
+    return ",".join(out) + "\r\n"
+
+
+def _export_statement(
     query: str,
     court: Optional[str],
     year: Optional[int],
     date_from: Optional[str],
     date_to: Optional[str],
     limit: int,
-) -> list[Case]:
-    """Build query, apply filters, and fetch rows."""
-    stmt = select(Case)
+) -> Select:
+    """Build the export query with filters applied."""
+    stmt = select(*_EXPORT_COLUMNS)
     conditions = []
 
-    if query:
-        term = f"%{query}%"
-        conditions.append(
-            or_(
-                Case.title.ilike(term),
-                Case.headnote.ilike(term),
-                Case.text.ilike(term),
-                Case.citation.ilike(term),
-            )
-        )
+    match = match_expression(query) if query and fts_enabled() else None
+    if match:
+        stmt = apply_match(stmt, match).order_by(bm25_score(), Case.id)
+    elif query:
+        conditions.append(like_condition(query))
 
     if court:
         conditions.append(Case.court.ilike(f"%{court}%"))
@@ -123,7 +176,20 @@ async def _fetch_export_rows(
     if conditions:
         stmt = stmt.where(and_(*conditions))
 
-    stmt = stmt.limit(min(limit, MAX_EXPORT_ROWS))
+    return stmt.limit(min(limit, MAX_EXPORT_ROWS))
+
 
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+async def _stream_export_rows(
+    db: AsyncSession,
+    query: str,
+    court: Optional[str],
+    year: Optional[int],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    limit: int,
+) -> AsyncIterator[list[Row]]:
+    """Fetch matching rows in batches of ``EXPORT_BATCH_SIZE``."""
+    stmt = _export_statement(query, court, year, date_from, date_to, limit)
+    result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield partition
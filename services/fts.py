@@ -0,0 +1,61 @@
+"""
+Text search helpers — SQLite FTS5 MATCH expressions, BM25 ranking, and the
+substring-matching fallback used on other backends.
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import Select, column, func, literal_column, or_, table
+
+from database import Case
+
+# Word characters only: FTS5 treats most punctuation as query syntax
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_cases_fts = table("cases_fts", column("rowid"))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Each word becomes a quoted string and the words are implicitly ANDed,
+    so ``Smith v. State`` matches documents containing all three terms.
+    Returns ``None`` when the query has no searchable words.
+    """
+    # The index folds case, so "Contract contract" would walk the same
+    # posting list twice (and count it twice in BM25); keep one of each
+    tokens = dict.fromkeys(t.lower() for t in _TOKEN_RE.findall(query or ""))
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"' for t in tokens)
+
+
+def bm25_score():
+    """BM25 rank of the current FTS5 row (lower is more relevant)."""
+    return func.bm25(literal_column("cases_fts")).label("score")
+
+
+def apply_match(stmt: Select, expression: str) -> Select:
+    """Join ``stmt`` to the FTS5 index and restrict it to matching rows."""
+    return stmt.join(
+        _cases_fts, _cases_fts.c.rowid == literal_column("cases.rowid")
+    ).where(literal_column("cases_fts").op("MATCH")(expression))
+
+
+def like_condition(query: str):
+    """
+    Case-insensitive substring match on title, headnote, text, or citation.
+
+    Kept as a single OR so the rows are scanned once; on PostgreSQL the
+    pg_trgm indexes created by ``init_db`` let the planner combine one
+    bitmap index scan per column instead.
+    """
+    term = f"%{query}%"
+    return or_(
+        Case.title.ilike(term),
+        Case.headnote.ilike(term),
+        Case.text.ilike(term),
+        Case.citation.ilike(term),
+    )
@@ -3,7 +3,36 @@ Search highlighting — wrap matched terms in <mark> tags for display.
 """
 
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Joins snippets for highlight_batch (ASCII unit separator)
+_SEPARATOR = "\x1f"
+
+
+class QueryPattern(NamedTuple):
+    """A query's lower-cased tokens, longest first, and their alternation."""
+
+    tokens: tuple[str, ...]
+    regex: re.Pattern
+
+
+@lru_cache(maxsize=1024)
+def compile_query(query: str) -> Optional[QueryPattern]:
+    """
+    Compile a case-insensitive alternation of the query's tokens.
+
+    Returns ``None`` when the query has no tokens. Compile once per page and
+    pass the result to :func:`highlight_with_pattern` for each snippet.
+    """
+    # Matching ignores case, so "Contract contract" needs one alternative
+    tokens = set(query.lower().split())
+    if not tokens:
+        return None
+    # Longest first, so a token wins over any shorter token that prefixes it
+    ordered = tuple(sorted(tokens, key=lambda t: (-len(t), t)))
+    regex = re.compile("(" + "|".join(re.escape(t) for t in ordered) + ")", re.IGNORECASE)
+    return QueryPattern(ordered, regex)
 
 
 def highlight_snippet(
@@ -34,18 +63,68 @@ def highlight_snippet(
     if not text or not query:
         return text[:max_length] + "..." if text and len(text) > max_length else text
 
-    # Split query into individual tokens for multi-word highlighting
-    tokens = [t.strip() for t in query.split() if t.strip()]
-    if not tokens:
+    # One pattern covering every query token, compiled once per query
+    pattern = compile_query(query)
+    if pattern is None:
         return text[:max_length] + "..." if len(text) > max_length else text
 
+    return highlight_with_pattern(text, pattern, max_length, tag)
+
+
+def highlight_with_pattern(
+    text: str,
+    pattern: QueryPattern,
+    max_length: int = 300,
+    tag: str = "mark",
+) -> str:
+    """
+    Like :func:`highlight_snippet`, with a pattern from :func:`compile_query`.
+    """
+    if not text:
+        return text
+
+    # Wrap every token in <tag> in a single pass, so a token can never match
+    # inside markup inserted for another one
+    return pattern.regex.sub(rf"<{tag}>\1</{tag}>", _window(text, pattern, max_length))
+
+
+def highlight_batch(
+    texts: list[Optional[str]],
+    query: str,
+    max_length: int = 300,
+    tag: str = "mark",
+) -> list[Optional[str]]:
+    """
+    Highlight a page of texts against one query.
+
+    Equivalent to calling :func:`highlight_snippet` on each text, but the
+    markup pass runs once over all snippets joined by a separator, instead of
+    once per snippet.
+    """
+    pattern = compile_query(query) if query else None
+    if pattern is None:
+        return [highlight_snippet(text, query, max_length, tag) for text in texts]
+
+    snippets = [_window(text, pattern, max_length) if text else "" for text in texts]
+    joined = _SEPARATOR.join(snippets)
+    # The separator is whitespace to str.split(), so no token can contain it;
+    # texts that do contain it would split wrongly, so highlight them one by one
+    if joined.count(_SEPARATOR) != len(snippets) - 1:
+        return [highlight_with_pattern(text, pattern, max_length, tag) if text else text
+                for text in texts]
+
+    marked = pattern.regex.sub(rf"<{tag}>\1</{tag}>", joined).split(_SEPARATOR)
+    return [m if text else text for m, text in zip(marked, texts, strict=True)]
+
+
+def _window(text: str, pattern: QueryPattern, max_length: int) -> str:
+    """Cut ``text`` to ``max_length`` around its first match, with ellipses."""
     # Find position of earliest match to centre the snippet
-    pattern = "|".join(re.escape(t) for t in tokens)
-    match = re.search(pattern, text, re.IGNORECASE)
+    first = _first_match(text, pattern)
 
-    if match:
+    if first >= 0:
         # Centre snippet around the match
-        start = max(0, match.start() - max_length // 3)
+        start = max(0, first - max_length // 3)
         end = start + max_length
     else:
         start = 0
@@ -59,13 +138,17 @@ def highlight_snippet(
     if end < len(text):
         snippet = snippet + "..."
 
-    # Wrap each token in <tag>
-    for token in tokens:
-        snippet = re.sub(
-            f"({re.escape(token)})",
-            rf"<{tag}>\1</{tag}>",
-            snippet,
-            flags=re.IGNORECASE,
-        )
-
     return snippet
+
+
+def _first_match(text: str, pattern: QueryPattern) -> int:
+    """Offset of the earliest token occurrence in ``text``, or -1."""
+    # A case-insensitive regex scan of a long headnote is several times slower
+    # than lower-casing it once and running str.find per token
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Some characters (e.g. "İ") grow when lower-cased, shifting offsets
+        match = pattern.regex.search(text)
+        return match.start() if match else -1
+    hits = [i for i in map(lowered.find, pattern.tokens) if i >= 0]
+    return min(hits, default=-1)
@@ -2,14 +2,41 @@
 Search service for legal cases.
 """
 
-import json
+import asyncio
+import base64
 from typing import Optional
+
+import orjson
 from sqlalchemy import select, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import StaticPool
 
-from database import Case
+from database import Case, fts_enabled
 from models import SearchResponse, CaseResponse, CaseDetail
-from services.highlight import highlight_snippet
+from services.fts import apply_match, bm25_score, like_condition, match_expression
+from services.highlight import highlight_batch
+
+# Columns needed to render a search result. The full judgment text can be
+# orders of magnitude larger than the rest of the row, so only its head is
+# fetched, for the snippet fallback when a case has no headnote.
+_RESULT_COLUMNS = (
+    Case.id,
+    Case.title,
+    Case.citation,
+    Case.court,
+    Case.date,
+    Case.headnote,
+    func.substr(Case.text, 1, 600).label("text_head"),
+)
+
+# Queries that would match (nearly) every case
+_STOPWORDS = frozenset({"the", "a", "an", "of", "in", "and", "or", "to"})
+
+# Deepest OFFSET served; past this, clients must use cursor pagination
+MAX_OFFSET = 10_000
+
+# Matches counted exactly; larger result sets report this as an estimate
+COUNT_CAP = 10_000
 
 
 async def search_cases(
@@ -22,30 +49,43 @@ async def search_cases(
     page: int = 1,
     per_page: int = 20,
     highlight: bool = True,
+    cursor: Optional[str] = None,
 ) -> SearchResponse:
     """
     Search for cases with filters and pagination.
     
-    Uses simple LIKE matching. For production, consider:
-    - Full-text search (PostgreSQL tsvector, SQLite FTS5)
-    - Elasticsearch integration
-    - Semantic search with embeddings
+    On SQLite the text query runs against the FTS5 index and results are
+    ranked by BM25. Other backends fall back to LIKE matching and order by
+    date, newest first.
+
+    Pass the ``next_cursor`` of a previous response as ``cursor`` for keyset
+    pagination: each page costs the same regardless of depth, and no total
+    count is computed. ``page`` (OFFSET) pagination is kept for backwards
+    compatibility, up to ``MAX_OFFSET`` rows deep.
+
+    Raises ``ValueError`` for a malformed cursor, a page past ``MAX_OFFSET``,
+    or a query too short or too common to be selective.
     """
+    # Reject pathological requests before they scan the whole table
+    query = (query or "").strip()
+    if len(query) < 2 or query.lower() in _STOPWORDS:
+        raise ValueError("Query too short or too common")
+    if not cursor and (page - 1) * per_page > MAX_OFFSET:
+        raise ValueError(
+            f"Page too deep for offset pagination (max offset {MAX_OFFSET}); use cursor"
+        )
+
     # Build base query
-    stmt = select(Case)
+    stmt = select(*_RESULT_COLUMNS)
     conditions = []
     
-    # Text search (title, headnote, text)
-    if query:
-        search_term = f"%{query}%"
-        conditions.append(
-            or_(
-                Case.title.ilike(search_term),
-                Case.headnote.ilike(search_term),
-                Case.text.ilike(search_term),
-                Case.citation.ilike(search_term),
-            )
-        )
+    # Text search (title, headnote, text, citation)
+    match = match_expression(query) if query and fts_enabled() else None
+    score = bm25_score() if match else None
+    if match:
+        stmt = apply_match(select(*_RESULT_COLUMNS, score), match)
+    elif query:
+        conditions.append(like_condition(query))
     
     # Filters
     if court:
@@ -64,50 +104,137 @@ async def search_cases(
     if conditions:
         stmt = stmt.where(and_(*conditions))
     
-    # Get total count
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = await db.scalar(count_stmt) or 0
+    count_stmt = None
+    if cursor:
+        # Keyset: seek past the last row of the previous page
+        stmt = stmt.where(_after_cursor(decode_cursor(cursor), score))
+    else:
+        # Count at most COUNT_CAP + 1 matches; beyond that report an estimate
+        capped = stmt.with_only_columns(Case.id).limit(COUNT_CAP + 1)
+        count_stmt = select(func.count()).select_from(capped.subquery())
     
-    # Pagination
-    offset = (page - 1) * per_page
-    stmt = stmt.offset(offset).limit(per_page)
+    # Best BM25 rank first (lower is better), otherwise newest first
+    if match:
+        stmt = stmt.order_by(score, Case.id)
+    else:
+        stmt = stmt.order_by(Case.date.desc().nulls_last(), Case.id.desc())
     
-    # Execute
-    result = await db.execute(stmt)
-    cases = result.scalars().all()
+    # Pagination — fetch one extra row to learn whether another page exists
+    if not cursor:
+        stmt = stmt.offset((page - 1) * per_page)
+    stmt = stmt.limit(per_page + 1)
     
-    # Format results
-    results = []
-    for case in cases:
-        # Create snippet from headnote or full text
-        source = case.headnote or case.text or ""
+    # Execute, running the count alongside the page fetch when possible
+    total = None
+    if count_stmt is None:
+        result = await db.execute(stmt)
+    elif _parallel_sessions(db):
+        total, result = await asyncio.gather(
+            _scalar_in_new_session(db, count_stmt), db.execute(stmt)
+        )
+    else:
+        total = await db.scalar(count_stmt)
+        result = await db.execute(stmt)
+    rows = result.all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    
+    # Create snippets from the headnote or the start of the full text,
+    # highlighting the whole page in one pass
+    sources = [row.headnote or row.text_head or "" for row in rows]
+    if highlight and query:
+        snippets = highlight_batch(sources, query, max_length=300)
+    else:
+        snippets = [s[:300] + "..." if len(s) > 300 else s or None for s in sources]
 
-        if highlight and query:
-            snippet = highlight_snippet(source, query, max_length=300)
-        else:
-            snippet = source[:300] + "..." if len(source) > 300 else source or None
+    results = []
+    for row, snippet in zip(rows, snippets, strict=True):
+        # Negate BM25 so that higher relevance means a better match
+        relevance = -row.score if match else 1.0
 
         results.append(CaseResponse(
-            id=case.id,
-            title=case.title,
-            citation=case.citation,
-            court=case.court,
-            date=case.date,
+            id=row.id,
+            title=row.title,
+            citation=row.citation,
+            court=row.court,
+            date=row.date,
             snippet=snippet,
-            relevance=1.0,  # Simple ranking; enhance with BM25/TF-IDF
+            relevance=relevance,
         ))
     
-    total_pages = (total + per_page - 1) // per_page
+    total_is_estimate = False
+    if total is not None:
+        total = total or 0
+        if total > COUNT_CAP:
+            total, total_is_estimate = COUNT_CAP, True
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.score if match else last.date, last.id)
     
     return SearchResponse(
         total=total,
         page=page,
         per_page=per_page,
-        total_pages=total_pages,
+        total_pages=(total + per_page - 1) // per_page if total is not None else None,
+        total_is_estimate=total_is_estimate,
+        has_more=has_more,
+        next_cursor=next_cursor,
         results=results,
     )
 
 
+def _parallel_sessions(db: AsyncSession) -> bool:
+    """Whether a second connection can query alongside ``db``."""
+    # StaticPool (in-memory SQLite) hands every session the same connection
+    return not isinstance(db.bind.pool, StaticPool)
+
+
+async def _scalar_in_new_session(db: AsyncSession, stmt):
+    """Run a scalar query on its own session; one session can't run two at once."""
+    async with AsyncSession(db.bind) as other:
+        return await other.scalar(stmt)
+
+
+def encode_cursor(key, case_id: str) -> str:
+    """Encode the sort key and id of the last row on a page as an opaque token."""
+    raw = orjson.dumps([key, case_id])
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a token produced by :func:`encode_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, case_id = orjson.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(case_id, str):
+        raise ValueError("Invalid cursor")
+    return key, case_id
+
+
+def _after_cursor(position: tuple, score=None):
+    """Keyset predicate selecting rows that sort after ``position``."""
+    key, case_id = position
+    if score is not None:
+        # (score ASC, id ASC)
+        if not isinstance(key, (int, float)):
+            raise ValueError("Invalid cursor")
+        return or_(score > key, and_(score == key, Case.id > case_id))
+    # (date DESC NULLS LAST, id DESC)
+    if key is not None and not isinstance(key, str):
+        raise ValueError("Invalid cursor")
+    if key is None:
+        return and_(Case.date.is_(None), Case.id < case_id)
+    return or_(
+        Case.date < key,
+        and_(Case.date == key, Case.id < case_id),
+        Case.date.is_(None),
+    )
+
+
 async def get_case_by_id(db: AsyncSession, case_id: str) -> Optional[CaseDetail]:
     """Fetch full case details by ID."""
     stmt = select(Case).where(Case.id == case_id)
@@ -121,8 +248,8 @@ async def get_case_by_id(db: AsyncSession, case_id: str) -> Optional[CaseDetail]
     judges = None
     if case.judges:
         try:
-            judges = json.loads(case.judges)
-        except json.JSONDecodeError:
+            judges = orjson.loads(case.judges)
+        except orjson.JSONDecodeError:
             judges = [case.judges]
     
     return CaseDetail(
@@ -2,64 +2,110 @@
 Statistics service for legal cases.
 """
 
-from sqlalchemy import select, func
+from collections.abc import Sequence
+
+from cachetools import TTLCache
+from sqlalchemy import RowMapping, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import Case
 from models import StatsResponse
 
+# Aggregates only change when cases are ingested; serve them from memory
+_stats_cache: TTLCache = TTLCache(maxsize=8, ttl=300)
+
+
+def configure_stats_cache(ttl: int) -> None:
+    """Replace the stats cache with one using ``ttl`` seconds (0 disables it)."""
+    global _stats_cache
+    _stats_cache = TTLCache(maxsize=8, ttl=ttl)
+
+
+def clear_stats_cache() -> None:
+    """Drop cached statistics, e.g. after ingesting cases."""
+    _stats_cache.clear()
+
 
 async def get_statistics(db: AsyncSession) -> StatsResponse:
     """Get overall statistics."""
-    # Total cases
-    total = await db.scalar(select(func.count(Case.id))) or 0
-    
-    # Unique courts
-    courts = await db.scalar(select(func.count(func.distinct(Case.court)))) or 0
-    
-    # Year range
-    min_year = await db.scalar(select(func.min(Case.year)))
-    max_year = await db.scalar(select(func.max(Case.year)))
+    if "overall" in _stats_cache:
+        return _stats_cache["overall"]
+
+    # All aggregates in one round-trip and a single pass over the table
+    stmt = select(
+        func.count(Case.id),
+        func.count(func.distinct(Case.court)),
+        func.min(Case.year),
+        func.max(Case.year),
+        func.avg(func.length(Case.text)),
+    )
+    total, courts, min_year, max_year, avg_length = (await db.execute(stmt)).one()
     
     year_range = None
     if min_year and max_year:
         year_range = {"min": min_year, "max": max_year}
     
-    # Average text length
-    avg_length = await db.scalar(select(func.avg(func.length(Case.text))))
-    
-    return StatsResponse(
-        total_cases=total,
-        total_courts=courts,
+    stats = StatsResponse(
+        total_cases=total or 0,
+        total_courts=courts or 0,
         year_range=year_range,
         avg_text_length=int(avg_length) if avg_length else None,
     )
+    _stats_cache["overall"] = stats
+    return stats
 
 
-async def get_court_stats(db: AsyncSession) -> list[dict]:
+async def get_court_stats(db: AsyncSession) -> Sequence[RowMapping]:
     """Get case count by court."""
+    if "courts" in _stats_cache:
+        return _stats_cache["courts"]
+
+    # Rows come back as dict-like mappings, "Unknown" filled in by the database
     stmt = (
-        select(Case.court, func.count(Case.id).label("count"))
+        select(
+            func.coalesce(Case.court, "Unknown").label("court"),
+            func.count(Case.id).label("count"),
+        )
         .group_by(Case.court)
         .order_by(func.count(Case.id).desc())
     )
     
-    result = await db.execute(stmt)
-    rows = result.all()
+    courts = (await db.execute(stmt)).mappings().all()
+    _stats_cache["courts"] = courts
+    return courts
+
+
+async def get_court_names(db: AsyncSession) -> list[str]:
+    """Get the distinct court names, alphabetically."""
+    if "court_names" in _stats_cache:
+        return _stats_cache["court_names"]
+
+    # Served from the leading column of ix_cases_court_year_date
+    stmt = (
+        select(Case.court)
+        .distinct()
+        .where(Case.court.isnot(None))
+        .order_by(Case.court)
+    )
     
-    return [{"court": row[0] or "Unknown", "count": row[1]} for row in rows]
+    result = await db.execute(stmt)
+    names = list(result.scalars().all())
+    _stats_cache["court_names"] = names
+    return names
 
 
-async def get_year_stats(db: AsyncSession) -> list[dict]:
+async def get_year_stats(db: AsyncSession) -> Sequence[RowMapping]:
     """Get case count by year."""
+    if "years" in _stats_cache:
+        return _stats_cache["years"]
+
     stmt = (
-        select(Case.year, func.count(Case.id).label("count"))
+        select(Case.year.label("year"), func.count(Case.id).label("count"))
         .where(Case.year.isnot(None))
         .group_by(Case.year)
         .order_by(Case.year.desc())
     )
     
-    result = await db.execute(stmt)
-    rows = result.all()
-    
-    return [{"year": row[0], "count": row[1]} for row in rows]
+    years = (await db.execute(stmt)).mappings().all()
+    _stats_cache["years"] = years
+    return years
@@ -2,24 +2,35 @@
 Shared test fixtures for Legal API tests.
 """
 
-import asyncio
-from typing import AsyncGenerator
-from unittest.mock import AsyncMock, MagicMock
+from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
+from typing import AsyncGenerator, NamedTuple, Optional
+from unittest.mock import AsyncMock
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+import database
+import main
 from main import app
-from database import get_db
+from database import Case, get_db, init_db
+
+# dbmocks attribute -> service function imported into main
+_SERVICE_FUNCTIONS = {
+    "search": "search_cases",
+    "case": "get_case_by_id",
+    "stats": "get_statistics",
+    "court_stats": "get_court_stats",
+    "court_names": "get_court_names",
+    "year_stats": "get_year_stats",
+}
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create a single event loop for the entire test session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def anyio_backend() -> str:
+    """Run every async test and fixture on asyncio, in one session-wide loop."""
+    return "asyncio"
 
 
 @pytest.fixture()
@@ -29,9 +40,9 @@ def mock_db_session() -> AsyncMock:
     return session
 
 
-@pytest.fixture()
+@pytest.fixture(autouse=True)
 def override_db(mock_db_session: AsyncMock):
-    """Override the get_db dependency with the mock session."""
+    """Override the get_db dependency with a fresh mock session per test."""
 
     async def _override() -> AsyncGenerator[AsyncSession, None]:
         yield mock_db_session
@@ -41,9 +52,35 @@ def override_db(mock_db_session: AsyncMock):
     app.dependency_overrides.clear()
 
 
-@pytest.fixture()
-async def client(override_db) -> AsyncGenerator[AsyncClient, None]:
-    """Async test client with mocked DB dependency."""
+@pytest.fixture(scope="session")
+def _dbmocks_session():
+    """Patch main's service functions once for the whole session."""
+    mocks = SimpleNamespace(**{
+        name: AsyncMock(wraps=getattr(main, func))
+        for name, func in _SERVICE_FUNCTIONS.items()
+    })
+    with pytest.MonkeyPatch.context() as mp:
+        for name, func in _SERVICE_FUNCTIONS.items():
+            mp.setattr(main, func, getattr(mocks, name))
+        yield mocks
+
+
+@pytest.fixture(autouse=True)
+def dbmocks(_dbmocks_session):
+    """
+    Service-layer mocks, e.g. ``dbmocks.search.return_value = {...}``.
+
+    Unconfigured mocks call through to the real function. Return values,
+    side effects and call records are reset after each test.
+    """
+    yield _dbmocks_session
+    for mock in vars(_dbmocks_session).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="session")
+async def client() -> AsyncGenerator[AsyncClient, None]:
+    """Async test client shared by the whole session (DB mocked per test)."""
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -53,26 +90,115 @@ async def client(override_db) -> AsyncGenerator[AsyncClient, None]:
 # Sample data helpers
 # ---------------------------------------------------------------------------
 
+class CaseRow(NamedTuple):
+    """Immutable stand-in for a ``cases`` row, read by attribute like a Row."""
+    id: str
+    title: str
+    citation: str
+    court: str
+    date: Optional[str]
+    year: Optional[int]
+    judges: str
+    headnote: str
+    text: str
+
+
+@lru_cache(maxsize=256)
 def make_case_row(
     id: str = "case_001",
     title: str = "Smith v. State",
     citation: str = "2024 SC 445",
     court: str = "Supreme Court",
-    date: str = "2024-03-15",
-    year: int = 2024,
+    date: Optional[str] = "2024-03-15",
+    year: Optional[int] = 2024,
     judges: str = '["Justice A", "Justice B"]',
     headnote: str = "Brief summary of the case.",
     text: str = "Full judgment text goes here.",
-):
-    """Build a mock Case-like object (SimpleNamespace-style)."""
-    row = MagicMock()
-    row.id = id
-    row.title = title
-    row.citation = citation
-    row.court = court
-    row.date = date
-    row.year = year
-    row.judges = judges
-    row.headnote = headnote
-    row.text = text
-    return row
+) -> CaseRow:
+    """
+    Build a Case-like row. Rows are cached and shared between calls; use
+    ``row._replace(...)`` or ``row._asdict()`` for a modified copy.
+    """
+    return CaseRow(id, title, citation, court, date, year, judges, headnote, text)
+
+
+# Rows seeded by case_db: both courts, repeated dates (to exercise the id
+# tie-break) and two undated cases. Every row's text contains "text".
+SAMPLE_CASES = tuple(
+    make_case_row(
+        id=f"case_{i:03d}",
+        title=f"Smith v. State {i}",
+        court="Supreme Court" if i % 2 == 0 else "High Court",
+        date=None if i % 5 == 3 else f"{2020 + i % 4}-01-15",
+        year=None if i % 5 == 3 else 2020 + i % 4,
+        headnote=(
+            "Breach of contract, damages awarded." if i % 2 == 0
+            else "Boundary dispute over land."
+        ),
+    )
+    for i in range(12)
+)
+
+
+@pytest.fixture()
+async def case_db(request, override_db, tmp_path_factory) -> AsyncGenerator[async_sessionmaker, None]:
+    """
+    A real SQLite database (with FTS5) seeded with SAMPLE_CASES, served by get_db.
+
+    In memory by default. Parametrize with ``indirect=True`` and ``"file"``
+    for an on-disk database, which gets a connection pool instead of
+    StaticPool.
+    """
+    if getattr(request, "param", "memory") == "file":
+        url = f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('db') / 'cases.db'}"
+    else:
+        url = "sqlite+aiosqlite:///:memory:"
+
+    with pytest.MonkeyPatch.context() as mp:
+        # init_db replaces these module globals; put the old ones back after
+        for name in ("engine", "async_session", "_fts_enabled"):
+            mp.setattr(database, name, getattr(database, name))
+        await init_db(url)
+        async with database.async_session() as session:
+            session.add_all(Case(**row._asdict()) for row in SAMPLE_CASES)
+            await session.commit()
+
+        # Serve requests from the real database instead of the mock session
+        del app.dependency_overrides[get_db]
+        try:
+            yield database.async_session
+        finally:
+            await database.engine.dispose()
+
+
+# Canonical service results, shared read-only by every test that needs one.
+# Assign them to dbmocks return values as-is; copy with dict(...) to vary.
+FAKE_SEARCH_RESULT = MappingProxyType({
+    "total": 1,
+    "page": 1,
+    "per_page": 20,
+    "total_pages": 1,
+    "results": (
+        MappingProxyType({
+            "id": "case_001",
+            "title": "Smith v. State",
+            "citation": "2024 SC 445",
+            "court": "Supreme Court",
+            "date": "2024-03-15",
+            "snippet": "Brief summary of the case.",
+            "relevance": 1.0,
+        }),
+    ),
+})
+
+FAKE_CASE_DETAIL = MappingProxyType({
+    "id": "case_001",
+    "title": "Smith v. State",
+    "citation": "2024 SC 445",
+    "court": "Supreme Court",
+    "date": "2024-03-15",
+    "judges": ("Justice A", "Justice B"),
+    "headnote": "Brief summary of the case.",
+    "text": "Full judgment text goes here.",
+    "citations_found": None,
+})
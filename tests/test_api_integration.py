@@ -0,0 +1,155 @@
+"""
+Integration tests for Legal API endpoints.
+
+Requests go through the ASGI app — routing, validation, auth, middleware
+and response encoding. All database calls are mocked.
+"""
+
+import logging
+import uuid
+from unittest.mock import patch
+
+import orjson
+import pytest
+from httpx import AsyncClient
+
+from middleware import JsonFormatter
+from tests.conftest import FAKE_SEARCH_RESULT
+
+# ---------------------------------------------------------------------------
+# Authentication
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+@patch("main._API_KEY", b"secret-key")
+@patch("main._API_KEY_ENABLED", True)
+async def test_api_key_required(dbmocks, client: AsyncClient):
+    """With auth enabled, only the configured X-API-Key is accepted."""
+    dbmocks.court_names.return_value = []
+
+    assert (await client.get("/api/v1/courts")).status_code == 403
+    resp = await client.get("/api/v1/courts", headers={"X-API-Key": "wrong"})
+    assert resp.status_code == 403
+    resp = await client.get("/api/v1/courts", headers={"X-API-Key": "secret-key"})
+    assert resp.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+async def test_search_returns_results(dbmocks, client: AsyncClient):
+    """GET /api/v1/search?q=... returns paginated results."""
+    dbmocks.search.return_value = FAKE_SEARCH_RESULT
+
+    resp = await client.get("/api/v1/search", params={"q": "constitutional"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 1
+    assert len(data["results"]) == 1
+    assert data["results"][0]["id"] == "case_001"
+
+
+@pytest.mark.anyio
+async def test_search_missing_query(client: AsyncClient):
+    """GET /api/v1/search without q returns 422."""
+    resp = await client.get("/api/v1/search")
+    assert resp.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_search_invalid_cursor(dbmocks, client: AsyncClient):
+    """GET /api/v1/search with a malformed cursor returns 400."""
+    dbmocks.search.side_effect = ValueError("Invalid cursor")
+
+    resp = await client.get("/api/v1/search", params={"q": "contract", "cursor": "bogus"})
+    assert resp.status_code == 400
+    assert dbmocks.search.call_args.kwargs["cursor"] == "bogus"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("params", [
+    {"q": " "},
+    {"q": "x"},
+    {"q": "The"},
+    {"q": "contract", "page": 1000, "per_page": 100},
+])
+async def test_search_rejects_unselective_requests(params, client: AsyncClient, override_db):
+    """Trivial queries and deep OFFSET pages are rejected before hitting the DB."""
+    resp = await client.get("/api/v1/search", params=params)
+    assert resp.status_code == 400
+    override_db.execute.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+async def test_request_id_header(dbmocks, client: AsyncClient):
+    """Response includes X-Request-ID header."""
+    dbmocks.court_names.return_value = ["Supreme Court"]
+    resp = await client.get("/api/v1/courts")
+    assert resp.status_code == 200
+    assert "X-Request-ID" in resp.headers
+
+
+@pytest.mark.anyio
+async def test_generated_request_id_is_uuid7(dbmocks, client: AsyncClient):
+    """Generated request IDs are time-ordered UUIDv7 values."""
+    dbmocks.court_names.return_value = ["Supreme Court"]
+    first = (await client.get("/api/v1/courts")).headers["X-Request-ID"]
+    second = (await client.get("/api/v1/courts")).headers["X-Request-ID"]
+    assert uuid.UUID(first).version == 7
+    assert uuid.UUID(first).variant == uuid.RFC_4122
+    assert first[:8] <= second[:8]  # leading bits are the timestamp
+
+
+@pytest.mark.anyio
+async def test_custom_request_id_preserved(dbmocks, client: AsyncClient):
+    """Client-provided X-Request-ID is echoed back."""
+    dbmocks.court_names.return_value = ["Supreme Court"]
+    resp = await client.get("/api/v1/courts", headers={"X-Request-ID": "my-custom-id-123"})
+    assert resp.headers["X-Request-ID"] == "my-custom-id-123"
+
+
+@pytest.mark.anyio
+async def test_response_time_header(dbmocks, client: AsyncClient):
+    """Response includes X-Response-Time header."""
+    dbmocks.court_names.return_value = ["Supreme Court"]
+    resp = await client.get("/api/v1/courts")
+    assert resp.headers["X-Response-Time"].endswith("ms")
+
+
+@pytest.mark.anyio
+async def test_health_not_logged(dbmocks, client: AsyncClient):
+    """Health probes skip the access log but keep the correlation headers."""
+    dbmocks.court_names.return_value = ["Supreme Court"]
+    with patch("middleware.logger") as mock_logger:
+        resp = await client.get("/health", headers={"X-Request-ID": "probe-1"})
+        mock_logger.info.assert_not_called()
+        await client.get("/api/v1/courts")
+        mock_logger.info.assert_called_once()
+
+    assert resp.json() == {"status": "healthy"}
+    assert resp.headers["X-Request-ID"] == "probe-1"
+    assert resp.headers["X-Response-Time"].endswith("ms")
+
+
+@pytest.mark.anyio
+async def test_access_log_structured_fields(dbmocks, client: AsyncClient):
+    """The access log line carries status and duration_ms as JSON keys."""
+    dbmocks.court_names.return_value = ["Supreme Court"]
+    with patch("middleware.logger") as mock_logger:
+        await client.get("/api/v1/courts")
+
+    (msg, *args), kwargs = mock_logger.info.call_args
+    record = logging.makeLogRecord({"msg": msg, "args": tuple(args), **kwargs["extra"]})
+    entry = orjson.loads(JsonFormatter().format(record))
+    assert entry["status"] == 200
+    assert isinstance(entry["duration_ms"], float)
+    assert entry["msg"].startswith("request -> 200 (")
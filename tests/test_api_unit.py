@@ -0,0 +1,153 @@
+"""
+Unit tests for Legal API endpoints.
+
+Path operations are awaited directly, skipping routing, middleware and HTTP
+encoding; see test_api_integration.py for tests that need the full stack.
+All database calls are mocked — no real DB is required.
+"""
+
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+from fastapi import HTTPException, Response
+
+from main import get_case, health, list_courts, stats, stats_by_court, stats_by_year
+from services.fts import match_expression
+from services.search import decode_cursor, encode_cursor
+from services.stats import clear_stats_cache, get_court_stats
+from tests.conftest import FAKE_CASE_DETAIL
+
+# ---------------------------------------------------------------------------
+# Health
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+async def test_health():
+    """health() returns status healthy."""
+    resp = await health()
+    assert resp.status_code == 200
+    assert orjson.loads(resp.body)["status"] == "healthy"
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+
+def test_cursor_roundtrip():
+    """Cursors decode back to the (sort key, id) they were built from."""
+    assert decode_cursor(encode_cursor("2024-03-15", "case_001")) == ("2024-03-15", "case_001")
+    assert decode_cursor(encode_cursor(-1.25, "case_002")) == (-1.25, "case_002")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_match_expression_dedupes_tokens():
+    """Repeated words, in any case, are sent to FTS5 once."""
+    assert match_expression("Smith v. State smith STATE") == '"smith" "v" "state"'
+    assert match_expression("?!") is None
+
+
+# ---------------------------------------------------------------------------
+# Get Case
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+async def test_get_case_found(dbmocks, mock_db_session):
+    """get_case returns case details when found."""
+    dbmocks.case.return_value = FAKE_CASE_DETAIL
+
+    data = await get_case("case_001", db=mock_db_session, _=True)
+    assert data["id"] == "case_001"
+    assert data["title"] == "Smith v. State"
+    dbmocks.case.assert_awaited_once_with(mock_db_session, "case_001")
+
+
+@pytest.mark.anyio
+async def test_get_case_not_found(dbmocks, mock_db_session):
+    """get_case raises 404 for a missing case."""
+    dbmocks.case.return_value = None
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_case("nonexistent", db=mock_db_session, _=True)
+    assert exc_info.value.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Stats and courts list
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("handler, mock_name, payload, check", [
+    pytest.param(
+        stats, "stats",
+        {
+            "total_cases": 500,
+            "total_courts": 12,
+            "year_range": {"min": 1950, "max": 2024},
+            "avg_text_length": 4200,
+        },
+        lambda d: d["total_cases"] == 500 and d["total_courts"] == 12,
+        id="stats",
+    ),
+    pytest.param(
+        stats_by_court, "court_stats",
+        [{"court": "Supreme Court", "count": 200}, {"court": "High Court", "count": 300}],
+        lambda d: len(d) == 2,
+        id="stats_courts",
+    ),
+    pytest.param(
+        stats_by_year, "year_stats",
+        [{"year": 2024, "count": 50}, {"year": 2023, "count": 80}],
+        lambda d: d[0]["year"] == 2024,
+        id="stats_years",
+    ),
+    pytest.param(
+        list_courts, "court_names",
+        ["High Court", "Supreme Court"],
+        lambda d: "Supreme Court" in d["courts"],
+        id="list_courts",
+    ),
+])
+async def test_stats_endpoints(handler, mock_name, payload, check, dbmocks, mock_db_session):
+    """Each stats endpoint returns what its service function produced."""
+    getattr(dbmocks, mock_name).return_value = payload
+
+    data = await handler(db=mock_db_session, _=True)
+    if isinstance(data, Response):
+        # Stats handlers return their pre-encoded JSON body
+        data = orjson.loads(data.body)
+    assert check(data)
+
+
+@pytest.mark.anyio
+async def test_stats_body_encoded_once_per_result(dbmocks, mock_db_session):
+    """The same cached stats result is not re-encoded; a new one is."""
+    dbmocks.year_stats.return_value = [{"year": 2024, "count": 50}]
+    first = await stats_by_year(db=mock_db_session, _=True)
+    second = await stats_by_year(db=mock_db_session, _=True)
+    assert second.body is first.body
+
+    dbmocks.year_stats.return_value = [{"year": 2024, "count": 51}]
+    third = await stats_by_year(db=mock_db_session, _=True)
+    assert orjson.loads(third.body) == [{"year": 2024, "count": 51}]
+
+
+@pytest.mark.anyio
+async def test_court_stats_cached(mock_db_session):
+    """Court stats are served from the TTL cache after the first query."""
+    clear_stats_cache()
+    rows = [{"court": "Supreme Court", "count": 200}, {"court": "Unknown", "count": 3}]
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = rows
+    mock_db_session.execute.return_value = result
+
+    first = await get_court_stats(mock_db_session)
+    second = await get_court_stats(mock_db_session)
+    assert first == second == rows
+    assert mock_db_session.execute.await_count == 1
+    clear_stats_cache()
@@ -2,71 +2,149 @@
 Tests for export and highlight features.
 """
 
+import csv
+import io
+
+import orjson
 import pytest
+import zstandard
 from httpx import AsyncClient
 
-from services.highlight import highlight_snippet
+from main import _accepts_zstd
+from services.export import _csv_line, zstd_stream
+from services.highlight import highlight_batch, highlight_snippet
+from tests.conftest import SAMPLE_CASES
 
 
 # ─── CSV Export ───────────────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
-async def test_export_csv(client: AsyncClient):
+@pytest.mark.anyio
+async def test_export_csv(case_db, client: AsyncClient):
     """CSV export returns valid CSV with headers."""
     resp = await client.get("/api/v1/export/csv", params={"q": "contract"})
     assert resp.status_code == 200
     assert resp.headers["content-type"].startswith("text/csv")
-    lines = resp.text.strip().split("\n")
-    assert lines[0] == "id,title,citation,court,date,year,judges,headnote"
-    assert len(lines) >= 2  # header + at least one data row
+    # csv.writer terminates records with \r\n; splitlines() drops both
+    assert resp.content.startswith(b"id,title,citation,court,date,year,judges,headnote\r\n")
+    lines = resp.content.strip().splitlines()
+    assert lines[0] == b"id,title,citation,court,date,year,judges,headnote"
+    assert len(lines) - 1 == int(resp.headers["X-Export-Count"]) >= 1
 
 
-@pytest.mark.asyncio
-async def test_export_csv_count_header(client: AsyncClient):
+@pytest.mark.anyio
+async def test_export_csv_count_header(case_db, client: AsyncClient):
     """CSV export includes X-Export-Count header."""
     resp = await client.get("/api/v1/export/csv", params={"q": "text"})
     assert "X-Export-Count" in resp.headers
-    assert int(resp.headers["X-Export-Count"]) >= 1
+    assert int(resp.headers["X-Export-Count"]) == len(SAMPLE_CASES)
 
 
-@pytest.mark.asyncio
-async def test_export_csv_with_filters(client: AsyncClient):
+@pytest.mark.anyio
+async def test_export_csv_with_filters(case_db, client: AsyncClient):
     """CSV export respects court filter."""
     resp = await client.get(
         "/api/v1/export/csv", params={"q": "text", "court": "Supreme Court"}
     )
     assert resp.status_code == 200
-    lines = resp.text.strip().split("\n")
+    lines = resp.content.strip().splitlines()
+    assert len(lines) - 1 == sum(row.court == "Supreme Court" for row in SAMPLE_CASES)
     for line in lines[1:]:
-        assert "Supreme Court" in line
+        assert b"Supreme Court" in line
 
 
-@pytest.mark.asyncio
-async def test_export_csv_no_results(client: AsyncClient):
+@pytest.mark.anyio
+async def test_export_csv_no_results(case_db, client: AsyncClient):
     """CSV export with no matches returns header only."""
     resp = await client.get("/api/v1/export/csv", params={"q": "xyznonexistent"})
     assert resp.status_code == 200
-    lines = resp.text.strip().split("\n")
+    lines = resp.content.strip().splitlines()
     assert len(lines) == 1  # header only
 
 
+def test_csv_line_matches_csv_writer():
+    """Hand-rolled CSV encoding is byte-identical to csv.writer."""
+    rows = [
+        ["plain", "Smith v. State", "", 2024],
+        ["comma, inside", 'quote " inside', "line\nbreak", "cr\rhere"],
+        ['["Justice A", "Justice B"]', " leading space", "trailing ", "x"],
+    ]
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    assert "".join(_csv_line(r) for r in rows) == buf.getvalue()
+
+
 # ─── JSONL Export ─────────────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
-async def test_export_jsonl(client: AsyncClient):
+@pytest.mark.anyio
+async def test_export_jsonl(case_db, client: AsyncClient):
     """JSONL export returns valid JSON lines."""
-    import json
-
     resp = await client.get("/api/v1/export/jsonl", params={"q": "contract"})
     assert resp.status_code == 200
     assert "ndjson" in resp.headers["content-type"]
-    lines = [l for l in resp.text.strip().split("\n") if l]
-    assert len(lines) >= 1
-    obj = json.loads(lines[0])
-    assert "id" in obj
-    assert "title" in obj
+    objs = [orjson.loads(line) for line in resp.content.splitlines() if line]
+    assert all("id" in obj and "title" in obj for obj in objs)
+    assert {obj["id"] for obj in objs} == {
+        row.id for row in SAMPLE_CASES if "contract" in row.headnote
+    }
+
+
+@pytest.mark.anyio
+async def test_export_streams_in_batches(case_db, client: AsyncClient, monkeypatch):
+    """Rows spanning several fetch batches are all exported, once each."""
+    monkeypatch.setattr("services.export.EXPORT_BATCH_SIZE", 5)
+    resp = await client.get("/api/v1/export/jsonl", params={"q": "text", "limit": 100})
+    ids = [orjson.loads(line)["id"] for line in resp.content.splitlines()]
+    assert sorted(ids) == sorted(row.id for row in SAMPLE_CASES)
+    assert resp.headers["X-Export-Count"] == str(len(SAMPLE_CASES))
+
+
+# ─── Compression ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.anyio
+async def test_zstd_stream_roundtrip():
+    """Compressed export chunks decompress to the original stream."""
+    chunks = ["id,title\r\n", b'{"id":"case_001"}\n' * 200, "", "tail\r\n"]
+
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    compressed = b"".join([c async for c in zstd_stream(source())])
+    expected = b"".join(c.encode() if isinstance(c, str) else c for c in chunks)
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(compressed) == expected
+    assert len(compressed) < len(expected)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/api/v1/export/csv", "/api/v1/export/jsonl"])
+async def test_export_zstd_content_encoding(path, case_db, client: AsyncClient):
+    """Exports are zstd-compressed on request and decompress to the plain body."""
+    params = {"q": "text"}
+    plain = await client.get(path, params=params, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+
+    async with client.stream(
+        "GET", path, params=params, headers={"Accept-Encoding": "gzip, zstd"}
+    ) as resp:
+        raw = b"".join([chunk async for chunk in resp.aiter_raw()])
+    assert resp.headers["Content-Encoding"] == "zstd"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(raw) == plain.content
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", False),
+    ("gzip, br", False),
+    ("gzip, zstd", True),
+    ("ZSTD;q=0.5", True),
+    ("zstd;q=0", False),
+])
+def test_accepts_zstd(header, expected):
+    """zstd is used only when Accept-Encoding allows it."""
+    assert _accepts_zstd(header) is expected
 
 
 # ─── Search Highlighting ─────────────────────────────────────────────────────
@@ -102,6 +180,12 @@ def test_highlight_no_match():
     assert "Some unrelated text" in result
 
 
+def test_highlight_token_matching_tag_name():
+    """A token that is also the tag name is not re-highlighted inside markup."""
+    result = highlight_snippet("Mark the contract.", "contract mark", max_length=200)
+    assert result == "<mark>Mark</mark> the <mark>contract</mark>."
+
+
 def test_highlight_empty_text():
     """Empty text returns None."""
     result = highlight_snippet(None, "test")
@@ -122,49 +206,47 @@ def test_highlight_long_text_centering():
     assert result.startswith("...")  # Trimmed from start
 
 
-@pytest.mark.asyncio
-async def test_search_with_highlight(client: AsyncClient):
+def test_highlight_centering_with_length_changing_lowercase():
+    """Centring stays aligned when lower-casing changes the text length."""
+    text = "İ" * 500 + " contract " + "B" * 500
+    result = highlight_snippet(text, "contract", max_length=100)
+    assert "<mark>contract</mark>" in result
+
+
+def test_highlight_batch_matches_single():
+    """Batch highlighting gives the same snippets as one call per text."""
+    texts = [
+        "The contract was breached.",
+        None,
+        "",
+        "A" * 500 + " breach of contract " + "B" * 500,
+        "No match here.",
+        "Unit\x1fseparator in a contract",
+    ]
+    expected = [highlight_snippet(t, "contract breach", max_length=100) for t in texts]
+    assert highlight_batch(texts, "contract breach", max_length=100) == expected
+    assert highlight_batch(texts[:5], "contract breach", max_length=100) == expected[:5]
+
+
+@pytest.mark.anyio
+async def test_search_with_highlight(case_db, client: AsyncClient):
     """Search endpoint returns highlighted snippets by default."""
     resp = await client.get("/api/v1/search", params={"q": "contract"})
     data = resp.json()
-    if data["results"]:
-        # At least one result should have <mark> in snippet
-        snippets = [r["snippet"] for r in data["results"] if r.get("snippet")]
-        assert any("<mark>" in s for s in snippets)
+    assert data["results"]
+    # At least one result should have <mark> in snippet
+    snippets = [r["snippet"] for r in data["results"] if r.get("snippet")]
+    assert any("<mark>" in s for s in snippets)
 
 
-@pytest.mark.asyncio
-async def test_search_no_highlight(client: AsyncClient):
+@pytest.mark.anyio
+async def test_search_no_highlight(case_db, client: AsyncClient):
     """Search with highlight=false returns plain snippets."""
     resp = await client.get(
         "/api/v1/search", params={"q": "contract", "highlight": "false"}
     )
     data = resp.json()
+    assert data["results"]
     for r in data["results"]:
         if r.get("snippet"):
             assert "<mark>" not in r["snippet"]
-
-
-# ─── Middleware ────────────────────────────────────────────────────────────────
-
-
-@pytest.mark.asyncio
-async def test_request_id_header(client: AsyncClient):
-    """Response includes X-Request-ID header."""
-    resp = await client.get("/health")
-    assert "X-Request-ID" in resp.headers
-
-
-@pytest.mark.asyncio
-async def test_custom_request_id_preserved(client: AsyncClient):
-    """Client-provided X-Request-ID is echoed back."""
-    resp = await client.get("/health", headers={"X-Request-ID": "my-custom-id-123"})
-    assert resp.headers["X-Request-ID"] == "my-custom-id-123"
-
-
-@pytest.mark.asyncio
-async def test_response_time_header(client: AsyncClient):
-    """Response includes X-Response-Time header."""
-    resp = await client.get("/health")
-    assert "X-Response-Time" in resp.headers
-    assert resp.headers["X-Response-Time"].endswith("ms")
@@ -0,0 +1,170 @@
+"""
+Tests for the search service against a real SQLite database (see case_db).
+"""
+
+import pytest
+from sqlalchemy import text
+
+from database import Case, fts_enabled, rebuild_fts
+from services import search as search_module
+from services.search import search_cases
+from tests.conftest import SAMPLE_CASES, make_case_row
+
+
+async def _walk(db, query: str, per_page: int) -> list:
+    """Follow next_cursor from the first page to the last; return every result."""
+    results, cursor = [], None
+    while True:
+        page = await search_cases(db, query, per_page=per_page, cursor=cursor)
+        assert len(page.results) <= per_page
+        results.extend(page.results)
+        if not page.has_more:
+            assert page.next_cursor is None
+            return results
+        assert len(page.results) == per_page
+        cursor = page.next_cursor
+
+
+# ─── Keyset Pagination ───────────────────────────────────────────────────────
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("per_page", [2, 3])  # 2 puts a cursor on an undated row
+async def test_cursor_walk_by_date(per_page, case_db, monkeypatch):
+    """Without FTS, pages follow (date DESC NULLS LAST, id DESC) with no gaps."""
+    monkeypatch.setattr("services.search.fts_enabled", lambda: False)
+    dated = sorted(
+        (row for row in SAMPLE_CASES if row.date), key=lambda r: (r.date, r.id), reverse=True
+    )
+    undated = sorted((row for row in SAMPLE_CASES if not row.date), key=lambda r: r.id, reverse=True)
+
+    async with case_db() as db:
+        results = await _walk(db, "text", per_page=per_page)
+
+    assert [r.id for r in results] == [row.id for row in dated + undated]
+
+
+@pytest.mark.anyio
+async def test_cursor_walk_by_relevance(case_db):
+    """With FTS, pages follow (bm25, id) and visit every match exactly once."""
+    async with case_db() as db:
+        first = await search_cases(db, "text", per_page=5)
+        results = await _walk(db, "text", per_page=5)
+
+    ids = [r.id for r in results]
+    assert sorted(ids) == sorted(row.id for row in SAMPLE_CASES)
+    assert len(set(ids)) == len(ids)
+    relevance = [r.relevance for r in results]
+    assert relevance == sorted(relevance, reverse=True)
+    assert [r.id for r in first.results] == ids[:5]
+    assert first.total == len(SAMPLE_CASES)
+
+
+@pytest.mark.anyio
+async def test_offset_pages_report_has_more(case_db):
+    """OFFSET pages fetch one extra row to set has_more without a gap."""
+    async with case_db() as db:
+        pages = [await search_cases(db, "text", page=n, per_page=5) for n in (1, 2, 3)]
+
+    assert [len(p.results) for p in pages] == [5, 5, 2]
+    assert [p.has_more for p in pages] == [True, True, False]
+    assert pages[0].total_pages == 3
+
+
+# ─── Full-Text Index ─────────────────────────────────────────────────────────
+
+
+async def _ids(db, query: str) -> list[str]:
+    return [r.id for r in (await search_cases(db, query)).results]
+
+
+@pytest.mark.anyio
+async def test_fts_ranks_denser_matches_first(case_db):
+    """BM25 ranks the case that mentions the term most first; relevance is positive."""
+    assert fts_enabled()
+    async with case_db() as db:
+        db.add_all([
+            Case(**make_case_row(id="once", headnote="A plea of estoppel failed.")._asdict()),
+            Case(**make_case_row(
+                id="often", headnote="Estoppel by deed; estoppel by record; estoppel."
+            )._asdict()),
+        ])
+        await db.commit()
+        page = await search_cases(db, "estoppel")
+
+    assert [r.id for r in page.results] == ["often", "once"]
+    assert page.results[0].relevance > page.results[1].relevance > 0
+
+
+@pytest.mark.anyio
+async def test_fts_triggers_follow_writes(case_db):
+    """Inserts, updates and deletes on cases are reflected in MATCH results."""
+    async with case_db() as db:
+        db.add(Case(**make_case_row(id="new", headnote="The zebracorn doctrine.")._asdict()))
+        await db.commit()
+        assert await _ids(db, "zebracorn") == ["new"]
+
+        case = await db.get(Case, "new")
+        case.headnote = "The unicorn doctrine."
+        await db.commit()
+        assert await _ids(db, "zebracorn") == []
+        assert await _ids(db, "unicorn") == ["new"]
+
+        await db.delete(case)
+        await db.commit()
+        assert await _ids(db, "unicorn") == []
+
+
+@pytest.mark.anyio
+async def test_rebuild_fts_restores_index(case_db):
+    """rebuild_fts re-indexes every case from the cases table."""
+    async with case_db() as db:
+        await db.execute(text("INSERT INTO cases_fts(cases_fts) VALUES ('delete-all')"))
+        await db.commit()
+        assert await _ids(db, "contract") == []
+
+        await rebuild_fts()
+        assert sorted(await _ids(db, "contract")) == sorted(
+            row.id for row in SAMPLE_CASES if "contract" in row.headnote
+        )
+
+
+# ─── Result Counts ───────────────────────────────────────────────────────────
+
+
+@pytest.mark.anyio
+async def test_count_capped_as_estimate(case_db, monkeypatch):
+    """Past COUNT_CAP matches the total is reported as an estimate."""
+    monkeypatch.setattr("services.search.COUNT_CAP", 5)
+    async with case_db() as db:
+        page = await search_cases(db, "text", per_page=2)
+
+    assert page.total == 5
+    assert page.total_is_estimate
+    assert page.total_pages == 3
+    assert page.has_more
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("case_db, parallel", [
+    ("memory", False),  # StaticPool: one shared connection
+    ("file", True),
+], indirect=["case_db"])
+async def test_count_alongside_page(case_db, parallel, monkeypatch):
+    """With a connection pool the count runs on its own session, concurrently."""
+    calls = []
+    real = search_module._scalar_in_new_session
+
+    async def spy(db, stmt):
+        calls.append(stmt)
+        return await real(db, stmt)
+
+    monkeypatch.setattr(search_module, "_scalar_in_new_session", spy)
+    async with case_db() as db:
+        assert search_module._parallel_sessions(db) is parallel
+        page = await search_cases(db, "contract", per_page=2)
+
+    assert len(calls) == int(parallel)
+    assert page.total == sum("contract" in row.headnote for row in SAMPLE_CASES)
+    assert not page.total_is_estimate
+    assert len(page.results) == 2